@@ -13,15 +13,26 @@ A comprehensive tool that:
 import os
 import re
 import sys
+import sqlite3
 import time
+import random
+import threading
+import weakref
 import subprocess
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from html import escape
 from functools import lru_cache
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Set, TextIO, Tuple, Optional
 from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Configuration
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
@@ -29,11 +40,26 @@ GITHUB_HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else
 MAVEN_CENTRAL_BASE = "https://repo1.maven.org/maven2"
 GITHUB_API_BASE = "https://api.github.com"
 
-# XML namespaces
-POM_NAMESPACES = {'m': 'http://maven.apache.org/POM/4.0.0'}
+# Top-level POM elements needed for license lookups
+_POM_SECTIONS = frozenset({'licenses', 'scm', 'parent'})
 
-# Rate limiting
-RATE_LIMIT_DELAY = 0.5  # seconds between API calls
+# Precompiled regular expressions
+_DOT_GIT_RE = re.compile(r'\.git$')
+
+# Concurrency and rate limiting
+MAX_CONCURRENT_LOOKUPS = 32  # packages enriched in parallel
+MAX_REQUESTS_PER_HOST = 8  # in-flight HTTP requests per remote host
+REQUESTS_PER_SECOND = 10  # token refill rate per remote host
+RATE_LIMIT_BURST = 10  # tokens a host bucket can accumulate
+MAX_RETRIES = 3  # retries on HTTP 429/503
+BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+MAX_RATE_LIMIT_WAIT = 60  # seconds; hosts asking for longer are skipped for the run
+HTTP_TIMEOUT = 10  # seconds
+
+# Persistent response cache
+CACHE_PATH = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "sbom_generator" / "cache.sqlite"
+CACHE_TTL = 30 * 24 * 60 * 60  # seconds before cached responses are refetched
+POM_MEMORY_CACHE_SIZE = 4096  # resolved POM coordinates kept in memory per run
 
 @dataclass
 class License:
@@ -41,9 +67,21 @@ class License:
     name: str
     url: Optional[str] = None
     
+    # Shared instances for licenses identified by name only
+    _interned = weakref.WeakValueDictionary()
+    
     def __post_init__(self):
         if not self.url:
             self.url = get_canonical_license_url(self.name)
+    
+    @classmethod
+    def get(cls, name: str) -> 'License':
+        """Return the shared License for a name, creating it on first use."""
+        license_obj = cls._interned.get(name)
+        if license_obj is None:
+            license_obj = cls(name=name)
+            cls._interned[name] = license_obj
+        return license_obj
 
 
 @dataclass
@@ -120,16 +158,26 @@ class LicenseMapper:
     def get_url(cls, license_name: str, context: str = "") -> Optional[str]:
         """Get canonical URL for a license name."""
         normalized_name = license_name.lower().strip().strip('"')
+        url = cls._resolve(normalized_name)
+        
+        if url is None and context:
+            print(f"Missing URL mapping for license '{normalized_name}' (context: {context})")
         
+        return url
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _resolve(normalized_name: str) -> Optional[str]:
+        """Resolve a normalized license name to its URL, memoized per name."""
         # Direct lookup
-        if normalized_name in cls._LICENSE_URLS:
-            return cls._LICENSE_URLS[normalized_name]
+        if normalized_name in LicenseMapper._LICENSE_URLS:
+            return LicenseMapper._LICENSE_URLS[normalized_name]
         
         # Heuristic matching
-        return cls._apply_heuristics(normalized_name, context)
+        return LicenseMapper._apply_heuristics(normalized_name)
     
     @classmethod
-    def _apply_heuristics(cls, license_name: str, context: str) -> Optional[str]:
+    def _apply_heuristics(cls, license_name: str) -> Optional[str]:
         """Apply heuristic rules to match license names."""
         if 'apache' in license_name and '2.0' in license_name:
             return cls._LICENSE_URLS['apache-2.0']
@@ -159,9 +207,6 @@ class LicenseMapper:
         if 'alfresco' in license_name:
             return cls._LICENSE_URLS['alfresco component license agreement']
         
-        if context:
-            print(f"Missing URL mapping for license '{license_name}' (context: {context})")
-        
         return None
 
 
@@ -180,8 +225,8 @@ class SyftRunner:
     )
     
     @staticmethod
-    def run(image: str, template_file: Optional[str] = None) -> str:
-        """Run Syft and return template output."""
+    def stream(image: str, template_file: Optional[str] = None) -> Iterator[str]:
+        """Run Syft and yield its template output line by line as it is produced."""
         cmd = [
             "syft", image,
             "--exclude", "/lib",
@@ -197,61 +242,337 @@ class SyftRunner:
         
         print(f"🔧 Running: {' '.join(cmd)}")
         
+        # stderr goes to a file so a chatty Syft can never block on a full pipe
+        with tempfile.TemporaryFile() as stderr:
+            try:
+                # Decode each line as it is read; never abort the stream on a bad byte
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr,
+                                           encoding='utf-8', errors='replace')
+            except FileNotFoundError:
+                print("Syft not found. Install from: https://github.com/anchore/syft")
+                sys.exit(1)
+            
+            with process:
+                yield from process.stdout
+            
+            if process.returncode != 0:
+                stderr.seek(0)
+                print(f"Syft failed: {stderr.read().decode(errors='replace')}")
+                sys.exit(1)
+
+
+class RequestSkipped(Exception):
+    """Raised when a request is not sent because its host is rate-limited or the run was interrupted."""
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter per remote host, tuned by response headers."""
+    
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, refill_time)
+        self._blocked_until: Dict[str, float] = {}
+        self._exhausted_until: Dict[str, float] = {}
+        self._cancelled = threading.Event()
+    
+    def acquire(self, host: str) -> None:
+        """Block until a request to host is allowed, or raise RequestSkipped."""
+        while True:
+            if self._cancelled.is_set():
+                raise RequestSkipped("run interrupted")
+            
+            with self._lock:
+                now = time.monotonic()
+                if self._exhausted_until.get(host, 0.0) > now:
+                    raise RequestSkipped(f"rate limit exhausted for {host}")
+                
+                tokens, refill_time = self._buckets.get(host, (self._burst, now))
+                tokens = min(self._burst, tokens + (now - refill_time) * self._rate)
+                
+                wait = self._blocked_until.get(host, 0.0) - now
+                if wait <= 0 and tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                
+                self._buckets[host] = (tokens, now)
+                if wait <= 0:
+                    wait = (1 - tokens) / self._rate
+            
+            self._cancelled.wait(wait)
+    
+    def cancel(self) -> None:
+        """Make pending and future acquire() calls raise RequestSkipped."""
+        self._cancelled.set()
+    
+    def block(self, host: str, seconds: float) -> None:
+        """Hold back all requests to host, or skip it if the wait exceeds MAX_RATE_LIMIT_WAIT."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            
+            if seconds <= MAX_RATE_LIMIT_WAIT:
+                self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
+                return
+            
+            exhausted_until = self._exhausted_until.get(host, 0.0)
+            if exhausted_until <= time.monotonic():
+                resume_at = (datetime.now() + timedelta(seconds=seconds)).strftime('%H:%M:%S')
+                print(f"Rate limit reached for {host} until {resume_at}; skipping further requests to it")
+            self._exhausted_until[host] = max(exhausted_until, until)
+    
+    def update(self, host: str, response: requests.Response) -> None:
+        """Adjust the host bucket from X-RateLimit-* and Retry-After headers."""
+        headers = response.headers
+        
+        retry_after = HostRateLimiter._parse_number(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.block(host, retry_after)
+        
+        remaining = HostRateLimiter._parse_number(headers.get("X-RateLimit-Remaining"))
+        if remaining is None:
+            return
+        
+        if remaining < 1:
+            reset = HostRateLimiter._parse_number(headers.get("X-RateLimit-Reset"))
+            if reset is not None:
+                self.block(host, max(0.0, reset - time.time()))
+            return
+        
+        with self._lock:
+            tokens, refill_time = self._buckets.get(host, (self._burst, time.monotonic()))
+            self._buckets[host] = (min(tokens, remaining), refill_time)
+    
+    @staticmethod
+    def _parse_number(value: Optional[str]) -> Optional[float]:
+        """Parse a numeric header value, ignoring anything else."""
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            print(f"Syft failed: {e.stderr}")
-            sys.exit(1)
-        except FileNotFoundError:
-            print("Syft not found. Install from: https://github.com/anchore/syft")
-            sys.exit(1)
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+class HttpClient:
+    """Shared HTTP access with per-host concurrency and rate limits."""
+    
+    RETRY_STATUS_CODES = {429, 503}
+    
+    _lock = threading.Lock()
+    _host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _rate_limiter = HostRateLimiter(REQUESTS_PER_SECOND, RATE_LIMIT_BURST)
+    
+    # One keep-alive pool per host, shared by all worker threads
+    _session = requests.Session()
+    _session.mount("https://", HTTPAdapter(pool_maxsize=MAX_REQUESTS_PER_HOST))
+    
+    @classmethod
+    def cancel(cls) -> None:
+        """Stop issuing requests, e.g. after the user interrupted the run."""
+        cls._rate_limiter.cancel()
+    
+    @classmethod
+    def get(cls, url: str, **kwargs) -> requests.Response:
+        """Issue a GET request, backing off when the host asks us to slow down."""
+        host = urlparse(url).netloc
+        
+        with cls._lock:
+            semaphore = cls._host_semaphores.setdefault(
+                host, threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+            )
+        
+        for attempt in range(MAX_RETRIES + 1):
+            cls._rate_limiter.acquire(host)
+            with semaphore:
+                response = cls._session.get(url, timeout=HTTP_TIMEOUT, **kwargs)
+            cls._rate_limiter.update(host, response)
+            
+            if response.status_code not in cls.RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+            
+            # Exponential backoff with jitter unless Retry-After already applied
+            if "Retry-After" not in response.headers:
+                delay = BACKOFF_BASE * 2 ** attempt
+                cls._rate_limiter.block(host, delay + random.uniform(0, delay))
+        
+        return response
+
+
+class ResponseCache:
+    """On-disk SQLite cache for Maven POMs and GitHub license lookups."""
+    
+    MISS = object()  # returned when nothing usable is cached
+    
+    enabled = True
+    _lock = threading.Lock()
+    _connection: Optional[sqlite3.Connection] = None
+    _error_reported = False
+    
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS pom_cache ("
+        "coord TEXT PRIMARY KEY, xml BLOB, fetched_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS github_cache ("
+        "repo_path TEXT PRIMARY KEY, spdx_id TEXT, html_url TEXT, fetched_at REAL NOT NULL)",
+    )
+    
+    @classmethod
+    def _connect(cls) -> Optional[sqlite3.Connection]:
+        """Open the cache database on first use, disabling the cache on failure."""
+        if cls._connection is None and cls.enabled:
+            try:
+                CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(CACHE_PATH), check_same_thread=False)
+                for statement in cls._SCHEMA:
+                    connection.execute(statement)
+                connection.commit()
+                cls._connection = connection
+            except (OSError, sqlite3.Error) as e:
+                print(f"Response cache disabled ({CACHE_PATH}) - {e}")
+                cls.enabled = False
+        return cls._connection
+    
+    @classmethod
+    def _get(cls, query: str, key: str):
+        """Run a lookup query, treating any database error as a cache miss."""
+        with cls._lock:
+            connection = cls._connect()
+            if connection is None:
+                return cls.MISS
+            try:
+                row = connection.execute(query, (key, time.time() - CACHE_TTL)).fetchone()
+            except sqlite3.Error as e:
+                cls._report_error(e)
+                return cls.MISS
+        return row if row is not None else cls.MISS
+    
+    @classmethod
+    def _put(cls, query: str, values: Tuple) -> None:
+        """Run an insert query, ignoring database errors such as a locked file."""
+        with cls._lock:
+            connection = cls._connect()
+            if connection is None:
+                return
+            try:
+                connection.execute(query, values + (time.time(),))
+                connection.commit()
+            except sqlite3.Error as e:
+                cls._report_error(e)
+                try:
+                    connection.rollback()
+                except sqlite3.Error:
+                    pass
+    
+    @classmethod
+    def _report_error(cls, error: sqlite3.Error) -> None:
+        """Print the first cache error of the run; later ones are silent."""
+        if not cls._error_reported:
+            print(f"Response cache error ({CACHE_PATH}), results will not be cached - {error}")
+            cls._error_reported = True
+    
+    @classmethod
+    def get_pom(cls, coord: str):
+        """Return cached POM bytes (None for a known 404) or MISS."""
+        row = cls._get("SELECT xml FROM pom_cache WHERE coord = ? AND fetched_at >= ?", coord)
+        return row if row is cls.MISS else row[0]
+    
+    @classmethod
+    def put_pom(cls, coord: str, xml: Optional[bytes]) -> None:
+        cls._put("INSERT OR REPLACE INTO pom_cache (coord, xml, fetched_at) VALUES (?, ?, ?)",
+                 (coord, xml))
+    
+    @classmethod
+    def get_github_license(cls, repo_path: str):
+        """Return a cached (spdx_id, html_url) tuple (None values for no license) or MISS."""
+        return cls._get("SELECT spdx_id, html_url FROM github_cache "
+                        "WHERE repo_path = ? AND fetched_at >= ?", repo_path)
+    
+    @classmethod
+    def put_github_license(cls, repo_path: str, spdx_id: Optional[str], html_url: Optional[str]) -> None:
+        cls._put("INSERT OR REPLACE INTO github_cache (repo_path, spdx_id, html_url, fetched_at) "
+                 "VALUES (?, ?, ?, ?)", (repo_path, spdx_id, html_url))
 
 
 class MavenCentralClient:
     """Client for fetching license information from Maven Central."""
     
+    # Bounded LRU of resolved POMs; in-flight entries let concurrent callers share one fetch
+    _resolved_lock = threading.Lock()
+    _resolved_poms: 'OrderedDict[Tuple[str, str, str], Future]' = OrderedDict()
+    
     @staticmethod
-    @lru_cache(maxsize=None)
-    def fetch_pom(group_id: str, artifact_id: str, version: str) -> Optional[ET.Element]:
-        """Fetch and parse POM file from Maven Central."""
+    def fetch_pom(group_id: str, artifact_id: str, version: str) -> Optional[bytes]:
+        """Fetch the raw POM file from Maven Central."""
         path = f"{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
         url = f"{MAVEN_CENTRAL_BASE}/{path}"
+        coord = f"{group_id}:{artifact_id}:{version}"
         
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return ET.fromstring(response.text)
+            xml = ResponseCache.get_pom(coord)
+            if xml is ResponseCache.MISS:
+                response = HttpClient.get(url)
+                if response.status_code == 200:
+                    xml = response.content
+                elif response.status_code == 404:
+                    xml = None
+                else:
+                    return None
+                ResponseCache.put_pom(coord, xml)
+            
+            return xml
+        except RequestSkipped:
+            pass
         except Exception as e:
             print(f"Failed to fetch POM for {group_id}:{artifact_id}:{version} - {e}")
         
         return None
     
     @staticmethod
-    def extract_licenses_from_pom(pom: ET.Element) -> List[License]:
-        """Extract license information from POM XML."""
-        licenses = []
+    def parse_pom_sections(xml: bytes) -> Dict[str, ET.Element]:
+        """Stream-parse a POM, keeping only its top-level licenses, scm and parent elements."""
+        sections = {}
+        depth = 0
+        
+        for event, elem in ET.iterparse(BytesIO(xml), events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            
+            depth -= 1
+            if depth != 1:
+                continue
+            
+            tag = elem.tag.rpartition('}')[2]
+            if tag in _POM_SECTIONS:
+                sections[tag] = elem
+                if len(sections) == len(_POM_SECTIONS):
+                    break
+            else:
+                # Release dependencies, build config, etc. as soon as they are parsed
+                elem.clear()
         
-        # Try both namespaced and non-namespaced license elements
-        license_elements = (pom.findall('.//m:licenses/m:license', POM_NAMESPACES) + 
-                          pom.findall('.//license'))
+        return sections
+    
+    @staticmethod
+    def extract_licenses_from_pom(sections: Dict[str, ET.Element]) -> List[License]:
+        """Extract license information from parsed POM sections."""
+        licenses = []
         
-        for lic_elem in license_elements:
-            name = (lic_elem.findtext('m:name', default='', namespaces=POM_NAMESPACES) or 
-                   lic_elem.findtext('name', default='')).strip()
-            url = (lic_elem.findtext('m:url', default='', namespaces=POM_NAMESPACES) or 
-                  lic_elem.findtext('url', default='')).strip()
-            
-            if name:
-                license_url = url or get_canonical_license_url(name, "Maven POM")
-                licenses.append(License(name=name, url=license_url))
+        licenses_elem = sections.get('licenses')
+        if licenses_elem is not None:
+            # '{*}' matches both namespaced and non-namespaced elements
+            for lic_elem in licenses_elem.iterfind('{*}license'):
+                name = lic_elem.findtext('{*}name', default='').strip()
+                url = lic_elem.findtext('{*}url', default='').strip()
+                
+                if name:
+                    license_url = url or get_canonical_license_url(name, "Maven POM")
+                    licenses.append(License(name=name, url=license_url))
         
         if licenses:
             return licenses
         
         # Fallback: try GitHub if no licenses found
-        scm_url = (pom.findtext('.//m:scm/m:url', default='', namespaces=POM_NAMESPACES) or 
-                  pom.findtext('.//scm/url', default=''))
+        scm = sections.get('scm')
+        scm_url = scm.findtext('{*}url', default='') if scm is not None else ''
         
         if scm_url:
             return GitHubClient.get_license_from_repo_url(scm_url)
@@ -259,38 +580,93 @@ class MavenCentralClient:
         return []
     
     @staticmethod
-    def lookup_license_recursively(group_id: str, artifact_id: str, version: str, 
-                                 max_depth: int = 4) -> List[License]:
-        """Recursively look up license information, checking parent POMs if necessary."""
-        if max_depth == 0:
-            return []
+    def _resolve_pom(group_id: str, artifact_id: str, version: str
+                     ) -> Optional[Tuple[Tuple[License, ...], Optional[Tuple[str, str, str]]]]:
+        """Resolve a POM once per run; concurrent callers for the same coordinates wait on one fetch."""
+        key = (group_id, artifact_id, version)
+        resolved = MavenCentralClient._resolved_poms
+        
+        with MavenCentralClient._resolved_lock:
+            future = resolved.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = resolved[key] = Future()
+                if len(resolved) > POM_MEMORY_CACHE_SIZE:
+                    resolved.popitem(last=False)
+            else:
+                resolved.move_to_end(key)
         
-        pom = MavenCentralClient.fetch_pom(group_id, artifact_id, version)
-        if pom is None:
-            return []
+        if not is_owner:
+            return future.result()
         
-        licenses = MavenCentralClient.extract_licenses_from_pom(pom)
-        if licenses:
-            return licenses
+        try:
+            result = MavenCentralClient._load_pom(group_id, artifact_id, version)
+        except BaseException as e:
+            # Let later callers retry instead of caching the failure
+            with MavenCentralClient._resolved_lock:
+                if resolved.get(key) is future:
+                    del resolved[key]
+            future.set_exception(e)
+            raise
+        
+        future.set_result(result)
+        return result
+    
+    @staticmethod
+    def _load_pom(group_id: str, artifact_id: str, version: str
+                  ) -> Optional[Tuple[Tuple[License, ...], Optional[Tuple[str, str, str]]]]:
+        """Fetch a POM and keep only its licenses and parent coordinates."""
+        xml = MavenCentralClient.fetch_pom(group_id, artifact_id, version)
+        if xml is None:
+            return None
+        
+        try:
+            sections = MavenCentralClient.parse_pom_sections(xml)
+        except ET.ParseError as e:
+            print(f"Failed to parse POM for {group_id}:{artifact_id}:{version} - {e}")
+            return None
         
-        # Check parent POM
-        parent = pom.find('m:parent', POM_NAMESPACES) or pom.find('parent')
+        licenses = tuple(MavenCentralClient.extract_licenses_from_pom(sections))
+        parent = None if licenses else MavenCentralClient._extract_parent(sections, group_id)
+        return licenses, parent
+    
+    @staticmethod
+    def _extract_parent(sections: Dict[str, ET.Element], group_id: str) -> Optional[Tuple[str, str, str]]:
+        """Extract parent POM coordinates, inheriting the child's groupId if absent."""
+        parent = sections.get('parent')
         if parent is None:
-            return []
+            return None
         
-        parent_group = (parent.findtext('m:groupId', default='', namespaces=POM_NAMESPACES) or 
-                       parent.findtext('groupId', default='') or group_id).strip()
-        parent_artifact = (parent.findtext('m:artifactId', default='', namespaces=POM_NAMESPACES) or 
-                          parent.findtext('artifactId', default='')).strip()
-        parent_version = (parent.findtext('m:version', default='', namespaces=POM_NAMESPACES) or 
-                         parent.findtext('version', default='')).strip()
+        parent_group = (parent.findtext('{*}groupId', default='') or group_id).strip()
+        parent_artifact = parent.findtext('{*}artifactId', default='').strip()
+        parent_version = parent.findtext('{*}version', default='').strip()
         
         if not (parent_artifact and parent_version):
-            return []
+            return None
+        
+        return parent_group, parent_artifact, parent_version
+    
+    @staticmethod
+    def lookup_license_recursively(group_id: str, artifact_id: str, version: str, 
+                                 max_depth: int = 4) -> List[License]:
+        """Look up license information, walking up parent POMs if necessary."""
+        coords = (group_id, artifact_id, version)
         
-        return MavenCentralClient.lookup_license_recursively(
-            parent_group, parent_artifact, parent_version, max_depth - 1
-        )
+        for _ in range(max_depth):
+            resolved = MavenCentralClient._resolve_pom(*coords)
+            if resolved is None:
+                return []
+            
+            licenses, parent = resolved
+            if licenses:
+                return list(licenses)
+            
+            # Continue with the parent POM
+            if parent is None:
+                return []
+            coords = parent
+        
+        return []
 
 
 class GitHubClient:
@@ -304,19 +680,31 @@ class GitHubClient:
         
         try:
             # Extract repo path from URL
-            repo_path = re.sub(r'\.git$', '', repo_url).split("github.com/")[1]
+            repo_path = _DOT_GIT_RE.sub('', repo_url).split("github.com/")[1]
             api_url = f"{GITHUB_API_BASE}/repos/{repo_path}/license"
             
-            response = requests.get(api_url, headers=GITHUB_HEADERS, timeout=10)
-            if response.status_code != 200:
+            cached = ResponseCache.get_github_license(repo_path)
+            if cached is ResponseCache.MISS:
+                response = HttpClient.get(api_url, headers=GITHUB_HEADERS)
+                if response.status_code == 200:
+                    data = response.json()
+                    cached = (data["license"]["spdx_id"], data["html_url"])
+                elif response.status_code == 404:
+                    cached = (None, None)
+                else:
+                    return []
+                ResponseCache.put_github_license(repo_path, *cached)
+            
+            spdx_id, html_url = cached
+            if not spdx_id:
                 return []
             
-            data = response.json()
-            spdx_id = data["license"]["spdx_id"]
-            license_url = get_canonical_license_url(spdx_id) or data["html_url"]
+            license_url = get_canonical_license_url(spdx_id) or html_url
             
             return [License(name=spdx_id, url=license_url)]
             
+        except RequestSkipped:
+            return []
         except Exception as e:
             print(f"Failed to fetch GitHub license for {repo_url} - {e}")
             return []
@@ -325,64 +713,60 @@ class GitHubClient:
 class PackageHeuristics:
     """Applies heuristic rules to determine licenses for common packages."""
     
-    HEURISTIC_RULES = {
-        'apache_packages': {
-            'license': License(name='Apache-2.0', url=get_canonical_license_url('apache-2.0')),
-            'conditions': [
-                lambda pkg: "org.apache" in pkg.purl,
-                lambda pkg: pkg.name.startswith(("tomcat", "tika-", "commons-")),
-                lambda pkg: pkg.name in {
-                    "catalina", "jasper", "catalina-ha", "catalina-tribes", 
-                    "catalina-ssi", "catalina-storeconfig"
-                }
-            ]
-        },
-        'jakarta_packages': {
-            'license': License(name='EPL-2.0', url=get_canonical_license_url('eclipse public license - v 2.0')),
-            'conditions': [lambda pkg: pkg.name.startswith("jakarta")]
-        },
-        'st4_packages': {
-            'license': License(name='BSD-3-Clause', url=get_canonical_license_url('bsd-3-clause')),
-            'conditions': [lambda pkg: pkg.name.startswith("st4") or pkg.name == "ST4"]
-        },
-        'acegi_packages': {
-            'license': License(name='Apache-2.0', url=get_canonical_license_url('apache-2.0')),
-            'conditions': [lambda pkg: pkg.name.startswith("acegi")]
-        }
-    }
+    _APACHE_LICENSE = License(name='Apache-2.0', url=get_canonical_license_url('apache-2.0'))
+    _EPL_LICENSE = License(name='EPL-2.0', url=get_canonical_license_url('eclipse public license - v 2.0'))
+    _BSD_LICENSE = License(name='BSD-3-Clause', url=get_canonical_license_url('bsd-3-clause'))
+    
+    _APACHE_PREFIXES = ("tomcat", "tika-", "commons-")
+    _APACHE_EXACT = frozenset({
+        "catalina", "jasper", "catalina-ha", "catalina-tribes", 
+        "catalina-ssi", "catalina-storeconfig"
+    })
+    
+    # (rule name, predicate, license), checked in order
+    HEURISTIC_RULES: Tuple[Tuple[str, Callable[[Package], bool], License], ...] = (
+        ('apache_packages',
+         lambda pkg: ("org.apache" in pkg.purl
+                      or pkg.name.startswith(PackageHeuristics._APACHE_PREFIXES)
+                      or pkg.name in PackageHeuristics._APACHE_EXACT),
+         _APACHE_LICENSE),
+        ('jakarta_packages', lambda pkg: pkg.name.startswith("jakarta"), _EPL_LICENSE),
+        ('st4_packages', lambda pkg: pkg.name.startswith("st4") or pkg.name == "ST4", _BSD_LICENSE),
+        ('acegi_packages', lambda pkg: pkg.name.startswith("acegi"), _APACHE_LICENSE),
+    )
     
     @classmethod
     def apply_heuristics(cls, package: Package) -> List[License]:
         """Apply heuristic rules to determine license for a package."""
-        for rule_name, rule_data in cls.HEURISTIC_RULES.items():
-            for condition in rule_data['conditions']:
-                if condition(package):
-                    print(f"Applied heuristic '{rule_name}' to {package.name}")
-                    return [rule_data['license']]
+        for rule_name, predicate, license_obj in cls.HEURISTIC_RULES:
+            if predicate(package):
+                print(f"Applied heuristic '{rule_name}' to {package.name}")
+                return [license_obj]
         return []
 
 
 class SyftOutputParser:
     """Parses Syft template output into Package objects."""
     
+    # Only used for lines the split-based fast path cannot handle
     PACKAGE_PATTERN = re.compile(r'^(.+?):(.+?):(.*?) - ?(.*)$')
     
     @staticmethod
-    def parse(syft_output: str) -> List[Package]:
-        """Parse Syft template output into Package objects."""
+    def parse(lines: Iterable[str]) -> List[Package]:
+        """Parse Syft template output lines into Package objects."""
         packages = []
         
-        for line_num, line in enumerate(syft_output.splitlines(), 1):
+        for line_num, line in enumerate(lines, 1):
             line = line.strip()
             if not line:
                 continue
                 
-            match = SyftOutputParser.PACKAGE_PATTERN.match(line)
-            if not match:
+            fields = SyftOutputParser._split_line(line)
+            if fields is None:
                 print(f"Could not parse line {line_num}: {line}")
                 continue
             
-            name, version, purl, license_text = [g.strip() for g in match.groups()]
+            name, version, purl, license_text = [f.strip() for f in fields]
             
             # Apply Alfresco-specific heuristic
             if name.startswith('alfresco-') and (not license_text or license_text == '-'):
@@ -400,25 +784,73 @@ class SyftOutputParser:
         
         return packages
     
+    @staticmethod
+    def _split_line(line: str) -> Optional[Tuple[str, str, str, str]]:
+        """Split a 'name:version:purl - licenses' line into its four fields."""
+        parts = line.split(':', 2)
+        if len(parts) == 3 and parts[0] and parts[1]:
+            purl, separator, license_text = parts[2].partition(' -')
+            if separator:
+                return parts[0], parts[1], purl, license_text
+        
+        # Unusual line (empty name/version, missing separator): defer to the regex
+        match = SyftOutputParser.PACKAGE_PATTERN.match(line)
+        return match.groups() if match else None
+    
     @staticmethod
     def _parse_license_text(license_text: str) -> List[License]:
         """Parse license text into License objects."""
         if not license_text or license_text == '-':
             return []
         
-        licenses = []
+        # Fast path: a single license name with nothing to split or strip
+        if ',' not in license_text and ';' not in license_text and '://' not in license_text:
+            name = license_text.strip()
+            return [License.get(name)] if name else []
+        
         # Split on commas, but not within "Version X.X" patterns
-        parts = re.split(r',\s*(?![Vv]ersion\b)', license_text)
+        parts = []
+        for part in license_text.split(','):
+            if parts and part.lstrip()[:7].lower() == 'version':
+                parts[-1] = f"{parts[-1]},{part}"
+            else:
+                parts.append(part)
         
+        licenses = []
         for part in parts:
-            part = part.strip()
             # Remove URLs and trailing semicolons
-            clean_name = re.sub(r'https?://\S+', '', part).split(';', 1)[0].strip()
+            clean_name = SyftOutputParser._strip_urls(part).split(';', 1)[0].strip()
             
             if clean_name:
-                licenses.append(License(name=clean_name))
+                licenses.append(License.get(clean_name))
         
         return licenses
+    
+    @staticmethod
+    def _strip_urls(text: str) -> str:
+        """Remove http(s) URLs, each from its scheme up to the next whitespace."""
+        start = text.find('http')
+        while start != -1:
+            if text.startswith('http://', start):
+                end = start + len('http://')
+            elif text.startswith('https://', start):
+                end = start + len('https://')
+            else:
+                start = text.find('http', start + 1)
+                continue
+            
+            url_start = end
+            while end < len(text) and not text[end].isspace():
+                end += 1
+            
+            if end == url_start:
+                # A bare scheme with nothing after it is not a URL
+                start = text.find('http', start + 1)
+                continue
+            
+            text = text[:start] + text[end:]
+            start = text.find('http', start)
+        return text
 
 
 class PackageDeduplicator:
@@ -426,29 +858,36 @@ class PackageDeduplicator:
     
     @staticmethod
     def deduplicate(packages: List[Package]) -> List[Package]:
-        """Deduplicate packages by (name, version) key, merging licenses."""
-        merged_packages = {}
+        """Deduplicate packages by (name, version) key, merging licenses into the first sighting."""
+        merged: Dict[Tuple[str, str], Package] = {}
+        license_names: Dict[Tuple[str, str], Set[str]] = {}
         
         for package in packages:
             key = package.unique_key
+            existing = merged.setdefault(key, package)
             
-            if key not in merged_packages:
-                merged_packages[key] = Package(
-                    name=package.name,
-                    version=package.version,
-                    purl=package.purl,
-                    licenses=[],
-                    license_source=package.license_source
-                )
-            
-            # Merge licenses, avoiding duplicates
-            existing_license_names = {lic.name for lic in merged_packages[key].licenses}
-            for license_obj in package.licenses:
-                if license_obj.name not in existing_license_names:
-                    merged_packages[key].licenses.append(license_obj)
-                    existing_license_names.add(license_obj.name)
+            if existing is package:
+                # Only packages listing several licenses can repeat a name
+                if len(package.licenses) > 1:
+                    names = license_names[key] = set()
+                    package.licenses = PackageDeduplicator._merge_licenses([], package.licenses, names)
+                continue
+            
+            names = license_names.get(key)
+            if names is None:
+                names = license_names[key] = {lic.name for lic in existing.licenses}
+            PackageDeduplicator._merge_licenses(existing.licenses, package.licenses, names)
         
-        return list(merged_packages.values())
+        return list(merged.values())
+    
+    @staticmethod
+    def _merge_licenses(target: List[License], licenses: List[License], names: Set[str]) -> List[License]:
+        """Append licenses whose names are not yet in names to target."""
+        for license_obj in licenses:
+            if license_obj.name not in names:
+                target.append(license_obj)
+                names.add(license_obj.name)
+        return target
 
 
 class LicenseEnricher:
@@ -463,37 +902,60 @@ class LicenseEnricher:
             print("All packages already have license information")
             return packages
         
-        print(f"Enriching {len(packages_without_licenses)} packages from external sources...")
-        
-        for i, package in enumerate(packages_without_licenses, 1):
-            print(f"[{i:3d}/{len(packages_without_licenses)}] {package.name}:{package.version}")
-            
-            if i > 1:
-                time.sleep(RATE_LIMIT_DELAY)  # Rate limiting
-            
-            licenses = LicenseEnricher._lookup_package_licenses(package)
-            
+        # Fast path: resolve what the in-memory heuristics can before any network call
+        unresolved = []
+        for package in packages_without_licenses:
+            licenses = PackageHeuristics.apply_heuristics(package)
             if licenses:
                 package.licenses = licenses
                 package.license_source = 'Maven/GitHub/Heuristic'
-                print(f"    Found: {', '.join(lic.name for lic in licenses)}")
             else:
-                print(f"    No license information found")
+                unresolved.append(package)
         
+        fast_path_count = len(packages_without_licenses) - len(unresolved)
+        print(f"Resolved {fast_path_count}/{len(packages_without_licenses)} packages by heuristics")
+        
+        if not unresolved:
+            return packages
+        
+        total = len(unresolved)
+        print(f"Enriching {total} packages from external sources...")
+        
+        executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LOOKUPS)
+        try:
+            futures = {
+                executor.submit(LicenseEnricher._lookup_package_licenses, package): package
+                for package in unresolved
+            }
+            
+            for i, future in enumerate(as_completed(futures), 1):
+                package = futures[future]
+                licenses = future.result()
+                print(f"[{i:3d}/{total}] {package.name}:{package.version}")
+                
+                if licenses:
+                    package.licenses = licenses
+                    package.license_source = 'Maven/GitHub/Heuristic'
+                    print(f"    Found: {', '.join(lic.name for lic in licenses)}")
+                else:
+                    print(f"    No license information found")
+        except BaseException:
+            # Drop queued lookups and wake in-flight ones instead of draining the queue
+            HttpClient.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        
+        executor.shutdown()
         return packages
     
     @staticmethod
     def _lookup_package_licenses(package: Package) -> List[License]:
-        """Look up license information for a single package."""
-        # Try Maven Central first
+        """Look up license information for a single package on Maven Central/GitHub."""
         maven_coords = LicenseEnricher._extract_maven_coordinates(package.purl)
-        if maven_coords:
-            licenses = MavenCentralClient.lookup_license_recursively(*maven_coords)
-            if licenses:
-                return licenses
+        if not maven_coords:
+            return []
         
-        # Apply heuristics as fallback
-        return PackageHeuristics.apply_heuristics(package)
+        return MavenCentralClient.lookup_license_recursively(*maven_coords)
     
     @staticmethod
     def _extract_maven_coordinates(purl: str) -> Optional[Tuple[str, str, str]]:
@@ -514,16 +976,14 @@ class HTMLReportGenerator:
     """Generates HTML reports from package data."""
     
     @staticmethod
-    def generate_report(packages: List[Package], image_name: str) -> str:
-        """Generate a comprehensive HTML report."""
+    def write_report(packages: List[Package], image_name: str, fp: TextIO) -> None:
+        """Write a comprehensive HTML report to an open text file, row by row."""
         stats = HTMLReportGenerator._calculate_statistics(packages)
-        package_rows = HTMLReportGenerator._generate_package_rows(packages)
         
-        return HTMLReportGenerator._render_html_template(
-            image_name=image_name,
-            stats=stats,
-            package_rows=package_rows
-        )
+        fp.write(HTMLReportGenerator._render_header(image_name, stats))
+        for row in HTMLReportGenerator._iter_package_rows(packages):
+            fp.write(row)
+        fp.write(HTMLReportGenerator._render_footer())
     
     @staticmethod
     def _calculate_statistics(packages: List[Package]) -> Dict:
@@ -545,10 +1005,20 @@ class HTMLReportGenerator:
             'license_coverage': f"{(packages_with_licenses / total_packages * 100):.1f}%" if total_packages > 0 else "0%"
         }
     
+    _ROW_TEMPLATE = (
+        '<tr>\n'
+        '  <td>%s</td>\n'
+        '  <td>%s</td>\n'
+        '  <td>%s%s</td>\n'
+        '</tr>\n'
+    )
+    _LINK_TEMPLATE = '<a href="%s" target="_blank" title="View license">%s</a>'
+    
     @staticmethod
-    def _generate_package_rows(packages: List[Package]) -> str:
-        """Generate HTML table rows for packages."""
-        rows = []
+    def _iter_package_rows(packages: List[Package]) -> Iterator[str]:
+        """Yield HTML table rows for packages."""
+        row_template = HTMLReportGenerator._ROW_TEMPLATE
+        link_template = HTMLReportGenerator._LINK_TEMPLATE
         
         # Sort packages by name for better readability
         sorted_packages = sorted(packages, key=lambda p: (p.name.lower(), p.version))
@@ -556,13 +1026,12 @@ class HTMLReportGenerator:
         for package in sorted_packages:
             license_links = []
             for license_obj in package.licenses:
-                if license_obj.url:
-                    license_links.append(
-                        f'<a href="{license_obj.url}" target="_blank" title="View license">'
-                        f'{license_obj.name}</a>'
-                    )
+                name = escape(license_obj.name)
+                # Only link http(s) URLs; anything else could inject script via href
+                if license_obj.url and license_obj.url.startswith(('http://', 'https://')):
+                    license_links.append(link_template % (escape(license_obj.url), name))
                 else:
-                    license_links.append(license_obj.name)
+                    license_links.append(name)
             
             license_cell = ', '.join(license_links) if license_links else 'No license specified'
             
@@ -571,19 +1040,14 @@ class HTMLReportGenerator:
             if package.license_source == 'Maven/GitHub/Heuristic':
                 source_indicator = ' <em>(enriched)</em>'
             
-            rows.append(
-                f'<tr>\n'
-                f'  <td>{package.name}</td>\n'
-                f'  <td>{package.version}</td>\n'
-                f'  <td>{license_cell}{source_indicator}</td>\n'
-                f'</tr>\n'
+            yield row_template % (
+                escape(package.name), escape(package.version), license_cell, source_indicator
             )
-        
-        return ''.join(rows)
     
     @staticmethod
-    def _render_html_template(image_name: str, stats: Dict, package_rows: str) -> str:
-        """Render the complete HTML template."""
+    def _render_header(image_name: str, stats: Dict) -> str:
+        """Render the HTML template up to the opening of the package table body."""
+        image_name = escape(image_name)
         return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -616,7 +1080,12 @@ class HTMLReportGenerator:
                 </tr>
             </thead>
             <tbody>
-                {package_rows}
+                """
+    
+    @staticmethod
+    def _render_footer() -> str:
+        """Render the HTML template from the close of the package table body."""
+        return f"""
             </tbody>
         </table>
         
@@ -636,60 +1105,54 @@ class HTMLReportGenerator:
 
 def main() -> None:
     """Main entry point for the SBOM generator."""
-    if len(sys.argv) < 2:
-        print("Usage: python sbom_generator.py <image> [template] [output]")
+    args = [arg for arg in sys.argv[1:] if arg != "--no-cache"]
+    
+    if not args:
+        print("Usage: python sbom_generator.py [--no-cache] <image> [template] [output]")
         print("\nExamples:")
         print("  python sbom_generator.py ubuntu:latest")
         print("  python sbom_generator.py my-app:v1.0 custom_template.tmpl")
         print("  python sbom_generator.py nginx:alpine - custom_report.html")
+        print("  python sbom_generator.py --no-cache ubuntu:latest")
         sys.exit(1)
 
     # Parse command line arguments
-    image_name = sys.argv[1]
-    template_file = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != '-' else None
-    output_file = sys.argv[3] if len(sys.argv) > 3 else "sbom_report.html"
+    image_name = args[0]
+    template_file = args[1] if len(args) > 1 and args[1] != '-' else None
+    output_file = args[2] if len(args) > 2 else "sbom_report.html"
+    ResponseCache.enabled = "--no-cache" not in sys.argv
 
     print(f"Starting SBOM analysis for: {image_name}")
     print("=" * 60)
 
     try:
-        # Step 1: Run Syft to generate SBOM
-        print("Running Syft to generate SBOM...")
-        syft_output = SyftRunner.run(image_name, template_file)
-        
-        if not syft_output.strip():
-            print("Syft produced no output. Check your image name and template.")
-            sys.exit(1)
-
-        # Step 2: Parse Syft output
-        print("Parsing Syft output...")
-        packages = SyftOutputParser.parse(syft_output)
+        # Steps 1-2: Run Syft and parse its output as it streams in
+        print("Running Syft to generate SBOM and parsing its output...")
+        packages = SyftOutputParser.parse(SyftRunner.stream(image_name, template_file))
         
         if not packages:
-            print("No packages found in Syft output. Check your template format.")
+            print("No packages found in Syft output. Check your image name and template format.")
             sys.exit(1)
         
         print(f"Found {len(packages)} packages")
 
-        # Step 3: Enrich missing license information
-        print("\nEnriching license information...")
-        packages = LicenseEnricher.enrich_packages(packages)
-
-        # Step 4: Deduplicate packages
+        # Step 3: Deduplicate packages so each one is enriched only once
         print("Deduplicating packages...")
         original_count = len(packages)
         packages = PackageDeduplicator.deduplicate(packages)
         
         if len(packages) != original_count:
-            print(f"Deduplicated: {original_count} → {len(packages)} packages")
+            print(f"Deduplicated: {original_count} → {len(packages)} packages before enrichment")
+
+        # Step 4: Enrich missing license information
+        print("\nEnriching license information...")
+        packages = LicenseEnricher.enrich_packages(packages)
 
         # Step 5: Generate HTML report
         print(f"Generating HTML report: {output_file}")
-        html_content = HTMLReportGenerator.generate_report(packages, image_name)
-        
-        # Write report to file
         output_path = Path(output_file)
-        output_path.write_text(html_content, encoding='utf-8')
+        with output_path.open('w', encoding='utf-8') as fp:
+            HTMLReportGenerator.write_report(packages, image_name, fp)
         
         # Final statistics
         packages_with_licenses = sum(1 for pkg in packages if pkg.has_licenses)